@@ -0,0 +1,41 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# (attribute name, serialized key, optional converter) of every serialized attribute of a model
+Spec = Tuple[Tuple[str, str, Optional[Callable[[Any], Any]]], ...]
+
+
+def to_dict(spec: Spec, item: object) -> Dict[str, Any]:
+    """
+    transform a model object into a dict, as described by spec. kept free of anything but the
+    per-record loop, so it can be compiled with mypyc
+    :param spec: Spec
+    :param item: model object
+    :return: Dict[str, Any]
+    """
+    ret: Dict[str, Any] = {}
+    for attr, key, converter in spec:
+        v = getattr(item, attr)
+        if converter is not None and v is not None:
+            v = converter(v)
+        ret[key] = v
+
+    return ret
+
+
+def mapping_to_dict(spec: Spec, mapping: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    transform a mapping of model attribute names, e.g. the row mapping of a select of the model columns,
+    into a dict, as described by spec. values are looked up by key, as rows can't expose every attribute
+    name as an attribute
+    :param spec: Spec
+    :param mapping: Mapping[str, Any]
+    :return: Dict[str, Any]
+    """
+    ret: Dict[str, Any] = {}
+    for attr, key, converter in spec:
+        v = mapping[attr]
+        if converter is not None and v is not None:
+            v = converter(v)
+        ret[key] = v
+
+    return ret
@@ -1,29 +1,93 @@
 # pylint:disable=E0611
 
+from copy import copy
 from datetime import datetime
 import enum
 import logging
-from typing import Any, Dict, List, Union
-from math import ceil
+from itertools import islice
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Iterable, List, Tuple, Union
 
 from falcon.errors import HTTPInternalServerError, HTTPBadRequest, HTTPMethodNotAllowed, HTTPNotFound
 import falcon_sqla
+from sqlalchemy import Column, RowMapping, Select, func, insert, select
 from sqlalchemy.exc import StatementError
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import DeclarativeMeta, Query
-from sqlalchemy.orm.collections import InstrumentedList
+from sqlalchemy.orm import DeclarativeMeta, Query, raiseload, selectinload
 
+from falcon_boilerplate._serialize import Spec, mapping_to_dict, to_dict
 from falcon_boilerplate.sqlaman import sqla_manager
 from falcon_boilerplate.exceptions import SqlaManagerRequired
-from falcon_boilerplate.strfunc import camel_case_to_snake_case
+from falcon_boilerplate.strfunc import camel_case_to_snake_case, lower_camel_case_it
+
+
+def _enum_to_list(value: enum.Enum) -> List[Any]:
+    return [value.value, value.name]
+
+
+def _convert_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return _enum_to_list(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return value
+
+
+def _required_check(required: Iterable[str]) -> Tuple[FrozenSet[str], str]:
+    required = list(required)
+    missing_fields = " & ".join(", ".join(required).rsplit(", ", maxsplit=1))
+    return frozenset(required), f"missing one or more fields, body must contain {missing_fields}"
+
+
+def _related_keys(pk: str) -> Callable[[Iterable[Any]], List[Any]]:
+    def related_keys(items: Iterable[Any]) -> List[Any]:
+        return [getattr(item, pk) for item in items]
+
+    return related_keys
 
 
 class Controller:
+    __slots__ = ("session", "timezone", "pk", "_record_spec", "logger", "_filter")
+
     c = False  # Controller has create/write access
     r = False  # Controller has read access
     u = False  # Controller has update/write access
     d = False  # Controller has delete access
-    model: DeclarativeMeta
+    model: ClassVar[DeclarativeMeta]
+    batch_size = 1000  # Amount of items sent per insert statement by create_many
+    serialized_relationships: Tuple[str, ...] = ()  # Collections serialized as lists of related primary keys
+    _ACTION_METHODS = (("create", "POST"), ("read", "GET"), ("update", "PUT"), ("delete", "DELETE"))
+    _supported_actions: FrozenSet[str] = frozenset()
+    _supported_methods: Tuple[str, ...] = ("HEAD", "OPTIONS")
+    _required_source: Any = None
+    _required_fields: FrozenSet[str] = frozenset()
+    _required_message = ""
+
+    # Model metadata, cached by _prepare_model
+    _pk: ClassVar[Column]
+    _pk_name: ClassVar[str]
+    _attribute_names: ClassVar[FrozenSet[str]]
+    _attribute_keys: ClassVar[Dict[str, str]]
+    _setable: ClassVar[Union[FrozenSet[str], None]]
+    _editable: ClassVar[Union[FrozenSet[str], None]]
+    _dict_spec: ClassVar[Spec]
+    _read_columns: ClassVar[Union[Tuple[Any, ...], None]]
+    _loader_options: ClassVar[Tuple[Any, ...]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Resolve the controller abilities once, rather than on every request
+        cls._supported_actions = frozenset(
+            action for action, _ in cls._ACTION_METHODS if getattr(cls, action[:1], False)
+        )
+        cls._supported_methods = ("HEAD", "OPTIONS") + tuple(
+            method for action, method in cls._ACTION_METHODS if action in cls._supported_actions
+        )
+
+        if hasattr(cls, "required"):
+            cls._required_source = cls.required
+            cls._required_fields, cls._required_message = _required_check(cls.required)
 
     def __init__(self, *, manager: falcon_sqla.Manager = None, logger: Union[logging.Logger, None] = None,
                  timezone: str = "Etc/UTC"):
@@ -36,11 +100,81 @@ class Controller:
 
         self.session = manager.session_scope
         self.timezone = timezone
-        self.pk = inspect(self.model).primary_key[0]
+        self._prepare_model()
+        self.pk = self._pk
+        self._record_spec = self._dict_spec
 
         # Add logger, if applicable
         self.logger = logger
 
+        # Resolve the optional filter method once, rather than for every record
+        self._filter = getattr(self, "filter", None)
+
+    @classmethod
+    def _prepare_model(cls):
+        """
+        inspect the controller model once and cache the results on the controller class.
+        relationships are only resolvable once the mappers are configured, hence this is
+        done on first instantiation rather than at class creation
+        """
+        if cls.__dict__.get("_prepared_model") is cls.model:
+            return
+
+        mapper = inspect(cls.model)
+        cls._pk = mapper.primary_key[0]
+        cls._pk_name = cls._pk.name
+        cls._attribute_names = frozenset(mapper.all_orm_descriptors.keys())
+        # Incoming keys are mostly the camel cased attribute names, or the names themselves. map those to the
+        # attribute name they convert to, so the conversion is skipped for them
+        keys = {key for name in cls._attribute_names for key in (name, lower_camel_case_it(name))}
+        cls._attribute_keys = {key: camel_case_to_snake_case(key) for key in keys}
+        cls._setable = frozenset(cls.model.__setable__) if hasattr(cls.model, "__setable__") else None
+        cls._editable = frozenset(cls.model.__editable__) if hasattr(cls.model, "__editable__") else None
+
+        # Describe how every serialized attribute is converted, so _to_dict doesn't have to inspect each value.
+        # the collection relationships listed in serialized_relationships are serialized as a list of the
+        # related primary keys. the spec is sorted by output key, so the serialized rows come out sorted
+        # without having to sort each of them
+        dict_spec = [(prop.key, prop.key, cls._converter(prop.columns[0].type)) for prop in mapper.column_attrs]
+        collections = [mapper.relationships[key] for key in cls.serialized_relationships]
+        for rel in collections:
+            related_pk = rel.mapper.get_property_by_column(rel.mapper.primary_key[0]).key
+            dict_spec.append((rel.key, rel.key, _related_keys(related_pk)))
+        cls._dict_spec = tuple(sorted(dict_spec, key=lambda spec: spec[1]))
+
+        # Models without serialized relationships can be read as plain rows of their columns. the row
+        # mappings are keyed by the model attribute names, so the same spec applies
+        cls._read_columns = None if collections else tuple(getattr(cls.model, prop.key) for prop in mapper.column_attrs)
+
+        # Eager load the relationships serialized by _to_dict, and make sure nothing else is lazy loaded
+        cls._loader_options = tuple(
+            selectinload(getattr(cls.model, rel.key)) for rel in collections
+        ) + (raiseload("*"),)
+        cls._prepared_model = cls.model
+
+    @staticmethod
+    def _converter(column_type) -> Union[Callable[[Any], Any], None]:
+        """
+        return the function converting values of a column type into something serializable, if any
+        :param column_type: SQLAlchemy column type
+        :return: Callable | None
+        """
+        try:
+            python_type = column_type.python_type
+        except NotImplementedError:
+            python_type = object
+
+        # The value type isn't known up front, e.g. for type decorators, check each value instead
+        if python_type is object:
+            return _convert_value
+
+        if issubclass(python_type, datetime):
+            return datetime.isoformat
+        if issubclass(python_type, enum.Enum):
+            return _enum_to_list
+
+        return None
+
     def create(self, item: dict) -> bool:
         """
         standard controller insert method
@@ -56,29 +190,7 @@ class Controller:
         if not self.supports("create"):
             raise HTTPMethodNotAllowed(allowed_methods=self.supported, description="create action not supported")
 
-        new_item = {}
-        for k, v in item.items():
-            k = camel_case_to_snake_case(k)
-
-            # Only set attributes that the model actually has
-            if not hasattr(self.model, k):
-                continue
-
-            # Don't allow setting certain columns, regardless
-            if k == self.pk.name:
-                continue
-
-            # Check if the model has defined what can be set
-            if hasattr(self.model, "__setable__") and k not in self.model.__setable__:
-                raise HTTPBadRequest(description=f"not allowed to set field {k}")
-
-            new_item[k] = v
-
-        if hasattr(self, "required"):
-            for field in self.required:
-                if field not in new_item:
-                    missing_fields = " & ".join(", ".join(self.required).rsplit(", ", maxsplit=1))
-                    raise HTTPBadRequest(description=f"missing one or more fields, body must contain {missing_fields}")
+        new_item = self._new_item(item)
 
         try:
             with self.session() as session:
@@ -90,6 +202,41 @@ class Controller:
                 self.logger.error(f"exception when creating item ({type(_err).__name__}): {_err}")
             raise HTTPInternalServerError(description="an unhandled error occurred when creating item")
 
+    def create_many(self, items: Iterable[Dict[Any, Any]]) -> bool:
+        """
+        standard controller bulk insert method, inserts all items in a single transaction using
+        executemany style insert statements
+        :param items: Iterable[Dict[Any, Any]]
+        new items defined as dicts. items are consumed in batches of `batch_size`, so iterators
+        are never materialized in full
+        :return: bool
+        :raises: HTTPInternalServerError
+        """
+        if self.model is None:
+            self.logger.error(f"model not set for {self.__class__.__name__}")
+            raise HTTPInternalServerError(description="an internal errors occurred")
+
+        if not self.supports("create"):
+            raise HTTPMethodNotAllowed(allowed_methods=self.supported, description="create action not supported")
+
+        items = iter(items)
+        try:
+            with self.session() as session:
+                while True:
+                    records = [self._new_item(item) for item in islice(items, self.batch_size)]
+                    if not records:
+                        break
+
+                    session.execute(insert(self.model), records)
+                session.commit()
+                return True
+        except HTTPBadRequest as _err:
+            raise _err
+        except Exception as _err:
+            if self.logger is not None:
+                self.logger.error(f"exception when creating items ({type(_err).__name__}): {_err}")
+            raise HTTPInternalServerError(description="an unhandled error occurred when creating items")
+
     def read_single(self, pk: Union[int, str]) -> Union[Dict[Any, Any], None]:
         """
         standard controller read method, returns a single record from primary key
@@ -110,21 +257,26 @@ class Controller:
 
         with self.session() as session:
             try:
-                query = session.query(self.model).filter(self.pk == pk)  # noqa: E711
                 if hasattr(self, "query_filter"):
-                    query = self.query_filter(query)
-
-                row = query.one_or_none()
+                    # Query filters are always given a select of the model
+                    stmt = self._list_select().where(self.pk == pk).options(*self._loader_options)
+                    row = session.scalars(stmt).one_or_none()
+                elif self._read_columns is not None:
+                    # Nothing but columns are serialized, skip the ORM and read a plain row mapping
+                    stmt = select(*self._read_columns).where(self.pk == pk)
+                    row = session.execute(stmt).mappings().one_or_none()
+                else:
+                    # Without a query filter the identity map can be consulted before hitting the database
+                    row = session.get(self.model, pk, options=self._loader_options)
             except StatementError:
                 raise HTTPNotFound(description="item not found")
 
-            if not row:
+            if row is None:
                 raise HTTPNotFound(description="item not found")
 
-            session.expunge(row)
             row = self._to_dict(row)
-            if hasattr(self, "filter"):
-                row = self.filter(row)
+            if self._filter is not None:
+                row = self._filter(row)
 
         return row
 
@@ -146,20 +298,49 @@ class Controller:
 
         ret = []
         with self.session() as session:
-            query = session.query(self.model)
-            if hasattr(self, "query_filter"):
-                query = self.query_filter(query)
-
-            offset = (max(page - 1, 0)) * size
-            rows = query.offset(offset).limit(size)
+            rows = session.scalars(self._paged(self._list_select(), page, size))
+            to_dict = self._to_dict
+            filter_ = self._filter
             for row in rows:
-                row = self._to_dict(row)
-                if hasattr(self, "filter"):
-                    row = self.filter(row)
-                ret.append(row)
+                row = to_dict(row)
+                ret.append(row if filter_ is None else filter_(row))
 
         return ret
 
+    def read_page(self, page: int = 1, size: int = 10) -> Tuple[List[Dict[Any, Any]], Dict[str, Any]]:
+        """
+        standard controller read method, returns a list of records along with its pagination object.
+        the total amount of records is counted by the same statement fetching the records
+        :param page: int
+        the current page. 0 is assumed as being the first page
+        :param size: int
+        the amount rows to return per page
+        :return: Tuple[List[Dict[Any, Any]], Dict[str, Any]]
+        """
+        if self.model is None:
+            self.logger.error(f"model not set for {self.__class__.__name__}")
+            raise HTTPInternalServerError(description="an internal errors occurred")
+
+        if not self.supports('read'):
+            raise HTTPMethodNotAllowed(allowed_methods=self.supported, description='read (list) action not supported')
+
+        ret = []
+        total = 0
+        with self.session() as session:
+            stmt = self._list_select()
+            rows = session.execute(self._paged(stmt, page, size).add_columns(func.count().over().label("_total")))
+            to_dict = self._to_dict
+            filter_ = self._filter
+            for row, total in rows:
+                row = to_dict(row)
+                ret.append(row if filter_ is None else filter_(row))
+
+            # Paging beyond the last record returns no rows to read the total from
+            if not ret and page > 1:
+                total = session.scalar(select(func.count()).select_from(stmt.subquery()))
+
+        return ret, self.paginated_object(total=total, page=page, size=size)
+
     def update(self, pk: Union[int, str], item: Dict[Any, Any]) -> bool:
         """
         standard controller update method, updates a single record from primary key
@@ -179,10 +360,10 @@ class Controller:
         try:
             with self.session() as session:
                 try:
-                    query = session.query(self.model)
+                    stmt = select(self.model).where(self.pk == pk)
                     if hasattr(self, "query_filter"):
-                        query = self.query_filter(query)
-                    row = query.filter(self.pk == pk).one_or_none()  # noqa: E711
+                        stmt = self.query_filter(stmt)
+                    row = session.scalars(stmt).one_or_none()
                 except StatementError:
                     raise HTTPNotFound(description="item not found")
 
@@ -191,18 +372,14 @@ class Controller:
 
                 for k, v in item.items():
                     # We expect json formatted item names, we convert them to snake case
-                    k = camel_case_to_snake_case(k)
+                    k = self._attribute_name(k)
 
-                    # Only update attributes that the model actually has
-                    if not hasattr(self.model, k):
-                        continue
-
-                    # Don't allow updating certain columns
-                    if k == self.pk.name:
+                    # Only update attributes that the model actually has, and don't allow updating certain columns
+                    if k not in self._attribute_names or k == self._pk_name:
                         continue
 
                     # Check if the model has defined what can be updated
-                    if hasattr(self.model, "__editable__") and k not in self.model.__editable__:
+                    if self._editable is not None and k not in self._editable:
                         continue
 
                     setattr(row, k, v)
@@ -219,7 +396,7 @@ class Controller:
 
     def delete(self, pk: Union[int, str]) -> bool:
         """
-        standard controller delete method, deletes a single record from primary key.
+        standard controller delete method, deletes a single record from primary key
         :param pk: int | str
         primary key of a record
         :return: bool
@@ -235,10 +412,10 @@ class Controller:
         try:
             with self.session() as session:
                 try:
-                    query = session.query(self.model)
+                    stmt = select(self.model).where(self.pk == pk)
                     if hasattr(self, "query_filter"):
-                        query = self.query_filter(query)
-                    row = query.filter(self.pk == pk).one_or_none()  # noqa: E711
+                        stmt = self.query_filter(stmt)
+                    row = session.scalars(stmt).one_or_none()
                 except StatementError:
                     raise HTTPNotFound(description="item not found")
 
@@ -249,6 +426,8 @@ class Controller:
                 session.commit()
 
             return True
+        except HTTPNotFound as _err:
+            raise _err
         except Exception as _err:
             if self.logger is not None:
                 self.logger.error(f"exception when delete item ({type(_err).__name__}): {_err}")
@@ -259,6 +438,7 @@ class Controller:
         """
         return pagination objects
         :param query: SQLAlchemy ORM query object
+        legacy alternative to `total`, costs an additional COUNT query. prefer `read_page` or pass the total
         :param total: int
         :param page: int
         :param size: int
@@ -277,7 +457,7 @@ class Controller:
         if query is not None:
             total = query.count()
 
-        pages = int(ceil(total / size))
+        pages = -(-total // size)
         next_ = page + 1 if page < pages else None
         previous = page - 1 if 1 < page <= pages else None
         ret = {
@@ -290,6 +470,28 @@ class Controller:
 
         return ret
 
+    def with_key_transform(self, transform: Callable[[str], str]) -> Union["Controller", None]:
+        """
+        return a copy of the controller serializing records with transformed keys, e.g. camel cased
+        identifiers, instead of the attribute names. the controller itself is left as is. not possible
+        if the controller has a `filter` method or overrides the read methods, as those may expect the
+        attribute names
+        :param transform: Callable[[str], str]
+        function transforming an attribute name into the serialized key
+        :return: Controller | None
+        the transformed copy, or None if the transform can't be applied
+        """
+        if self._filter is not None:
+            return None
+
+        cls = type(self)
+        if cls.read_single is not Controller.read_single or cls.read_list is not Controller.read_list:
+            return None
+
+        ret = copy(self)
+        ret._record_spec = tuple((attr, transform(key), converter) for attr, key, converter in self._dict_spec)
+        return ret
+
     def supports(self, action) -> bool:
         """
         method to determine controller abilities (create/write, read, update/write, delete)
@@ -298,61 +500,96 @@ class Controller:
 
         :return: bool
         """
-        return getattr(self, action[:1].lower(), False)
+        return action in self._supported_actions
 
     @property
-    def supported(self) -> List[str]:
+    def supported(self) -> Tuple[str, ...]:
         """
-        returns a list methods allowed by this controller
-        :return:
+        returns the methods allowed by this controller
+        :return: Tuple[str, ...]
         """
-        ret = ["HEAD", "OPTIONS"]
-        for action, method in {"create": "POST", "read": "GET", "update": "PUT", "delete": "DELETE"}.items():
-            if self.supports(action):
-                ret.append(method)
+        return self._supported_methods
 
-        return ret
+    def _list_select(self) -> Select:
+        """
+        return the statement selecting all listable records
+        :return: Select
+        """
+        stmt = select(self.model)
+        if hasattr(self, "query_filter"):
+            stmt = self.query_filter(stmt)
 
-    @staticmethod
-    def _sorted(item: dict) -> dict:
+        return stmt
+
+    def _paged(self, stmt: Select, page: int, size: int) -> Select:
         """
-        sort a dict by key
-        :param item: dict
-        :return: dict
+        limit a list statement to a single page, eager loading what _to_dict needs
+        :param stmt: Select
+        :param page: int
+        :param size: int
+        :return: Select
+        """
+        offset = (max(page - 1, 0)) * size
+        return stmt.options(*self._loader_options).offset(offset).limit(size)
+
+    def _attribute_name(self, key: str) -> str:
+        """
+        return the snake cased attribute name of a json formatted item name. known names are looked up, anything
+        else is converted, without caching it, as the keys come from the request body
+        :param key: str
+        :return: str
+        """
+        name = self._attribute_keys.get(key)
+        return camel_case_to_snake_case(key) if name is None else name
+
+    def _new_item(self, item: Dict[Any, Any]) -> Dict[Any, Any]:
         """
-        return dict(sorted(item.items()))
+        sanitize a new item before insertion
+        :param item: Dict[Any, Any]
+        new item defined as dict, with json formatted item names
+        :return: Dict[Any, Any]
+        :raises: HTTPBadRequest
+        """
+        new_item = {}
+        for k, v in item.items():
+            k = self._attribute_name(k)
+
+            # Only set attributes that the model actually has, and don't allow setting certain columns, regardless
+            if k not in self._attribute_names or k == self._pk_name:
+                continue
+
+            # Check if the model has defined what can be set
+            if self._setable is not None and k not in self._setable:
+                raise HTTPBadRequest(description=f"not allowed to set field {k}")
+
+            new_item[k] = v
+
+        required = getattr(self, "required", None)
+        if required is not None and required is not self._required_source:
+            # Required fields set on the instance, e.g. in __init__, rather than on the controller class
+            required_fields, required_message = _required_check(required)
+        else:
+            required_fields, required_message = self._required_fields, self._required_message
+
+        if not required_fields <= new_item.keys():
+            raise HTTPBadRequest(description=required_message)
+
+        return new_item
 
     def _to_dict(self, item):
         """
         transform model object into a dict
-        :param item: model object
+        :param item: model object, or row mapping of its columns
         :return: dict
         """
         if isinstance(item, tuple):
             item = item[0]
 
         try:
-            ret = {}
-            for k in item.__table__.columns:
-                v = getattr(item, k.name)
-
-                if isinstance(v, InstrumentedList):
-                    ret[k] = []
-                    for item in v:
-                        ret[k].append(item.id)
-                    continue
-
-                if isinstance(v, enum.Enum):
-                    v = [
-                        v.value,
-                        v.name
-                    ]
-
-                if isinstance(v, datetime):
-                    v = v.isoformat()
-
-                ret[k.name] = v
-            ret = self._sorted(ret)
+            if isinstance(item, RowMapping):
+                ret = mapping_to_dict(self._record_spec, item)
+            else:
+                ret = to_dict(self._record_spec, item)
         except Exception as _err:
             if self.logger is not None:
                 self.logger.error(f"controller.to_dict: unhandled exception ({type(_err).__name__}): {_err}")
@@ -1,10 +1,13 @@
-from typing import Any, Dict, List, Protocol, Union
+from typing import Any, Dict, Iterable, List, Protocol, Tuple, Union
 
 
 class Controller(Protocol):
     def create(self, item: Dict[Any, Any]) -> bool:
         pass
 
+    def create_many(self, items: Iterable[Dict[Any, Any]]) -> bool:
+        pass
+
     def read_single(self, pk: Union[int, str]) -> Union[Dict[Any, Any], None]:
         pass
 
@@ -21,5 +24,5 @@ class Controller(Protocol):
         pass
 
     @property
-    def supported(self) -> List[str]:
+    def supported(self) -> Tuple[str, ...]:
         ...
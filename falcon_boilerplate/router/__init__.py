@@ -1,7 +1,9 @@
 from .base import BaseRouter
+from .cache import CachingRouter
 from .controller import ControllerRouter
 
 __all__ = [
     "BaseRouter",
+    "CachingRouter",
     "ControllerRouter",
 ]
@@ -2,15 +2,33 @@
 
 import json
 import logging
-from typing import Union
+from typing import Any, Callable, Union
 
-from falcon import App, HTTPBadRequest, HTTPInvalidHeader, HTTPMissingHeader, HTTPUnauthorized
+from falcon import App, HTTPBadRequest, HTTPInvalidHeader, HTTPMissingHeader, HTTPUnauthorized, Request
 from falcon import status_codes
 
 from falcon_boilerplate.strfunc import lower_camel_case_it, proper_slash_it
 
 
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode()
+
+
+try:
+    import orjson
+
+    _dumps: Callable[[Any], bytes] = orjson.dumps  # pylint:disable=E1101
+    _loads: Callable[[Any], Any] = orjson.loads  # pylint:disable=E1101
+except ImportError:
+    _dumps = _json_dumps
+    _loads = json.loads
+
+
 class BaseRouter:
+    __slots__ = (
+        "app", "status", "bad_request", "invalid_header", "missing_header", "unauthorized", "logger", "_route_prefix",
+    )
+
     base_path = "/"
     version = None
     app: App
@@ -30,6 +48,9 @@ class BaseRouter:
         # Add logger, if applicable
         self.logger = logger
 
+        # Prefix of all routes added by the router
+        self._route_prefix = f"{self.base_path}/v{self.version}" if self.version is not None else self.base_path
+
     def add_route(self, path: str, **kwargs):
         """
         add a route to the application
@@ -38,29 +59,53 @@ class BaseRouter:
         :param kwargs: key word arguments for the falcon app 'add_route' method
             the options available are 'suffix' and 'compile'
         """
-        _version = f"v{self.version}" if self.version is not None else ""
-        _route_path = self._validate_path(f"{self.base_path}/{_version}/{path}")
+        _route_path = self._validate_path(f"{self._route_prefix}/{path}")
         if self.logger is not None:
             self.logger.debug(f"adding route {_route_path}")
         self.app.add_route(_route_path, self, **kwargs)
 
-    def json(self, body):
+    def json(self, body, camel_case: Union[bool, None] = None) -> bytes:
         """
-        return json dumped string
+        return json dumped bytes, using orjson if it is installed
         :param body: python object, dictionary, set or list. anything serializable by the json library
-        :return: str
+        :param camel_case: bool | None
+        whether to camel case the identifiers of body, defaults to `camel_case_identifiers`
+        :return: bytes
         """
-        if self.camel_case_identifiers:
-            if isinstance(body, list):
-                ret = []
-                for item in body:
-                    ret.append(self.camel_case(item))
+        if camel_case is None:
+            camel_case = self.camel_case_identifiers
 
-                body = ret
+        if camel_case:
+            if isinstance(body, list):
+                body = [self.camel_case(item) for item in body]
             elif isinstance(body, dict):
                 body = self.camel_case(body)
 
-        return json.dumps(body)
+        return _dumps(body)
+
+    def read_json(self, req: Request) -> Any:
+        """
+        return the python object of the json body of a request, read in a single call. None if the body is empty
+        :param req: Request
+        :return: Any
+        :raises: ValueError
+        if the body isn't valid json
+        """
+        # Don't bother reading the body if the request says there is none
+        if req.content_length == 0:
+            return None
+
+        body = req.bounded_stream.read(req.content_length or -1)
+        return self.parse_json(body) if body else None
+
+    @staticmethod
+    def parse_json(data: bytes) -> Any:
+        """
+        return the python object of json data, using orjson if it is installed
+        :param data: bytes
+        :return: Any
+        """
+        return _loads(data)
 
     @staticmethod
     def camel_case(item: dict) -> dict:
@@ -69,11 +114,7 @@ class BaseRouter:
         :param item: dict
         :return: dict
         """
-        ret = {}
-        for k, v in item.items():
-            ret[lower_camel_case_it(k)] = v
-
-        return ret
+        return {lower_camel_case_it(k): v for k, v in item.items()}
 
     @staticmethod
     def _validate_path(path: str):
@@ -89,13 +130,27 @@ class BaseRouter:
     @staticmethod
     def get_param(key: str, params: dict) -> Union[str, None]:
         """
-        get the key from request params, if present
+        get the key from request params, if present. the key is matched case-insensitively, use `lower_params`
+        once instead when looking up several params of the same request
         :param key: str
         :param params: dict
         :return: str
         """
+        if key in params:
+            return params[key]
+
+        key = key.lower()
         for k, v in params.items():
-            if k.lower() == key.lower():
+            if k.lower() == key:
                 return v
 
         return None
+
+    @staticmethod
+    def lower_params(params: dict) -> dict:
+        """
+        return request params with lower cased keys, allowing case-insensitive lookups of lower cased keys
+        :param params: dict
+        :return: dict
+        """
+        return {k.lower(): v for k, v in params.items()}
@@ -0,0 +1,53 @@
+from typing import Any, List, Union
+
+from falcon.routing import CompiledRouter
+
+
+class CachingRouter(CompiledRouter):
+    """
+    falcon compiled router remembering recent matches in a fixed size, direct mapped cache, so repeated
+    requests for the same path skip the route lookup and field conversion. pass an instance to the app
+    using `App(router=CachingRouter())`
+    """
+
+    # Number of cached paths, must be a power of two
+    cache_size = 512
+
+    def __init__(self):
+        # The cache slot is picked by masking the path hash, which only works for powers of two
+        if self.cache_size <= 0 or self.cache_size & (self.cache_size - 1):
+            raise ValueError("cache_size must be a power of two")
+        super().__init__()
+        self._cache: List[Any] = [None] * self.cache_size
+
+    def add_route(self, uri_template: str, resource: object, **kwargs: Any) -> None:
+        """
+        add a route, and forget all cached matches as they may no longer be correct
+        :param uri_template: str
+        :param resource: object
+        :return:
+        """
+        super().add_route(uri_template, resource, **kwargs)
+        self._cache = [None] * self.cache_size
+
+    def find(self, uri: str, req: Union[Any, None] = None) -> Any:
+        """
+        find the route matching uri, from the cache if possible. each hit gets its own copy of the params,
+        as they are passed on to (and may be changed by) middleware and responders
+        :param uri: str
+        :param req: Request
+        :return: tuple of resource, method map, params and uri template, or None if no route matches
+        """
+        slot = hash(uri) & (self.cache_size - 1)
+        entry = self._cache[slot]
+        if entry is not None and entry[0] == uri:
+            route = entry[1]
+        else:
+            route = super().find(uri, req)
+            self._cache[slot] = (uri, route)
+
+        if route is None:
+            return None
+
+        resource, method_map, params, uri_template = route
+        return resource, method_map, dict(params), uri_template
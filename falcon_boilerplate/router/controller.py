@@ -1,77 +1,155 @@
 # pylint:disable=E0611
 
-import json
 import logging
-from typing import Union
+from functools import wraps
+from typing import Any, Callable, Union
 
-from falcon import App, HTTPBadRequest, HTTPInternalServerError, HTTPMethodNotAllowed, HTTPNotFound, Request, Response
+from falcon import MEDIA_JSON, App, HTTPError, HTTPInternalServerError, HTTPMethodNotAllowed, Request, Response
 
 from falcon_boilerplate.protocols import Controller
 from falcon_boilerplate.router import BaseRouter
+from falcon_boilerplate.strfunc import lower_camel_case_it
+
+_EMPTY_OBJECT = b"{}"
+
+
+def _http_errors(responder: Callable) -> Callable:
+    """
+    translate unhandled exceptions raised by a responder into an internal server error
+    :param responder: Callable
+    :return: Callable
+    """
+    @wraps(responder)
+    def wrapper(self, req: Request, res: Response, *args, **kwargs):
+        try:
+            return responder(self, req, res, *args, **kwargs)
+        except HTTPError:
+            raise
+        except Exception as _err:
+            if self.logger is not None:
+                self.logger.error(f"unhandled exception {responder.__name__} ({type(_err).__name__}): {_err}")
+            raise HTTPInternalServerError(description="unhandled exception in backend") from _err
+
+    return wrapper
 
 
 class ControllerRouter(BaseRouter):
+    __slots__ = (
+        "controller", "_records_camel_cased", "_create", "_create_many", "_read_single", "_read_list", "_update",
+        "_delete",
+    )
+
+    bulk_create: bool = False  # Router creates multiple records from a posted list, through create_many
+
     def __init__(self, app: App, controller: Controller, logger: Union[logging.Logger, None] = None):
         super().__init__(app, logger)
 
-        # Set controller for router
+        # Set controller for router. records are read through a copy of it camel casing their identifiers, if
+        # possible, leaving the controller itself untouched
         self.controller = controller
+        reader = None
+        with_key_transform = getattr(controller, "with_key_transform", None)
+        if self.camel_case_identifiers and with_key_transform is not None:
+            reader = with_key_transform(lower_camel_case_it)
+        self._records_camel_cased = reader is not None
+        if reader is None:
+            reader = controller
+
+        # Bind the controller methods once, rather than looking them up on every request. actions the controller
+        # does not implement answer with 405
+        self._create = getattr(controller, "create", self._not_allowed)
+        self._create_many = getattr(controller, "create_many", self._not_allowed)
+        self._read_single = getattr(reader, "read_single", self._not_allowed)
+        self._read_list = getattr(reader, "read_list", self._not_allowed)
+        self._update = getattr(controller, "update", self._not_allowed)
+        self._delete = getattr(controller, "delete", self._not_allowed)
 
         # Add endpoints. Support should be handled in the individual controller
         self.add_route("/{pk}")
-        self.add_route("/")
+        self.add_route("/", suffix="list")
+
+    def _not_allowed(self, *args, **kwargs):
+        """
+        stand-in for controller methods that are not implemented
+        :return:
+        """
+        raise HTTPMethodNotAllowed(allowed_methods=self.controller.supported)
 
-    def on_post(self, req: Request, res: Response):
+    def _read_item(self, req: Request, many: bool = False) -> Any:
         """
-        create a new record
+        return the python object of the json body of a request, which must be a non-empty object. answers with 400
+        if it is empty, invalid or anything else
+        :param req: Request
+        :param many: bool
+        whether a non-empty list of non-empty objects is accepted as well
+        :return: Dict[str, Any] | List[Dict[str, Any]]
+        """
+        try:
+            item = self.read_json(req)
+        except ValueError:
+            raise self.bad_request(description="invalid json body") from None
+
+        if item is None:
+            raise self.bad_request(description="empty body")
+
+        if many and isinstance(item, list):
+            if item and all(isinstance(entry, dict) and entry for entry in item):
+                return item
+        elif isinstance(item, dict) and item:
+            return item
+
+        if many:
+            raise self.bad_request(description="body must be a non-empty object, or a non-empty list of them")
+        raise self.bad_request(description="body must be a non-empty object")
+
+    @_http_errors
+    def on_post_list(self, req: Request, res: Response):
+        """
+        create a new record, or multiple records if the body is a list and `bulk_create` is set
         :param req: Request
         :param res: Response
         :return:
         """
-        try:
-            item = json.load(req.bounded_stream)
-            if item and self.controller.create(item=item):
-                res.status = 201
-                res.text = "{}"
-                return
-
-            raise HTTPInternalServerError(description="unable to save record")
-        except (HTTPBadRequest, HTTPMethodNotAllowed, HTTPNotFound) as _err:
-            raise _err
-        except Exception as _err:
-            if isinstance(_err, HTTPInternalServerError):
-                raise _err
+        item = self._read_item(req, many=self.bulk_create)
+        if isinstance(item, list):
+            created = self._create_many(items=item)
+        else:
+            created = self._create(item=item)
+
+        if created:
+            res.status = 201
+            res.content_type = MEDIA_JSON
+            res.data = _EMPTY_OBJECT
+            return
 
-            if self.logger is not None:
-                self.logger.error(f"unhandled exception on_get ({type(_err).__name__}): {_err}")
-        raise HTTPInternalServerError(description="unhandled exception in backend")
+        raise HTTPInternalServerError(description="unable to save record")
 
-    def on_get(self, req: Request, res: Response, pk: Union[int, str, None] = None):
+    @_http_errors
+    def on_get(self, req: Request, res: Response, pk: Union[int, str]):
         """
         get a single record
         :param req: Request
         :param res: Response
-        :param pk: optional primary key of record
+        :param pk: primary key of record
         :return:
         """
-        try:
-            if pk is not None:
-                record = self.controller.read_single(pk=pk)
-                res.text = self.json(record)
-            else:
-                records = self.controller.read_list()
-                res.text = self.json(records)
-            return
-        except (HTTPMethodNotAllowed, HTTPNotFound) as _err:
-            raise _err
-        except Exception as _err:
-            if isinstance(_err, HTTPInternalServerError):
-                raise _err
+        record = self._read_single(pk=pk)
+        res.content_type = MEDIA_JSON
+        res.data = self.json(record, camel_case=False if self._records_camel_cased else None)
 
-            if self.logger is not None:
-                self.logger.error(f"unhandled exception on_get ({type(_err).__name__}): {_err}")
-        raise HTTPInternalServerError(description="unhandled exception in backend")
+    @_http_errors
+    def on_get_list(self, req: Request, res: Response):
+        """
+        get a list of records
+        :param req: Request
+        :param res: Response
+        :return:
+        """
+        records = self._read_list() or []
+        res.content_type = MEDIA_JSON
+        res.data = self.json(records, camel_case=False if self._records_camel_cased else None)
 
+    @_http_errors
     def on_put(self, req: Request, res: Response, pk: Union[int, str]):
         """
         update a single record
@@ -80,27 +158,17 @@ class ControllerRouter(BaseRouter):
         :param pk: primary key of record
         :return:
         """
-        try:
-            item = json.load(req.bounded_stream)
-            if item and self.controller.update(pk=pk, item=item):
-                res.status = 204
-                res.text = ""
-                return
-
-            raise HTTPInternalServerError(description="unable to save record")
-        except (HTTPMethodNotAllowed, HTTPNotFound) as _err:
-            raise _err
-        except Exception as _err:
-            if isinstance(_err, HTTPInternalServerError):
-                raise _err
+        item = self._read_item(req)
+        if self._update(pk=pk, item=item):
+            res.status = 204
+            return
 
-            if self.logger is not None:
-                self.logger.error(f"unhandled exception on_get ({type(_err).__name__}): {_err}")
-        raise HTTPInternalServerError(description="unhandled exception in backend")
+        raise HTTPInternalServerError(description="unable to save record")
 
     def on_patch(self, req: Request, res: Response, pk: Union[int, str]):
         """
-        update a partial single record. this will just call `on_get`
+        update a single record, handled just like on_put. forwarded at runtime, so subclasses overriding on_put
+        change both
         :param req: Request
         :param res: Response
         :param pk: primary key of record
@@ -108,6 +176,7 @@ class ControllerRouter(BaseRouter):
         """
         self.on_put(req, res, pk)
 
+    @_http_errors
     def on_delete(self, req: Request, res: Response, pk: Union[int, str]):
         """
         delete a single record
@@ -116,19 +185,8 @@ class ControllerRouter(BaseRouter):
         :param pk: primary key of record
         :return:
         """
-        try:
-            if self.controller.delete(pk=pk):
-                res.status = 204
-                res.text = ""
-                return
-
-            raise HTTPInternalServerError(description="unable to delete record")
-        except (HTTPMethodNotAllowed, HTTPNotFound) as _err:
-            raise _err
-        except Exception as _err:
-            if isinstance(_err, HTTPInternalServerError):
-                raise _err
+        if self._delete(pk=pk):
+            res.status = 204
+            return
 
-            if self.logger is not None:
-                self.logger.error(f"unhandled exception on_get ({type(_err).__name__}): {_err}")
-        raise HTTPInternalServerError(description="unhandled exception in backend")
+        raise HTTPInternalServerError(description="unable to delete record")
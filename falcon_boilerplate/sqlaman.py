@@ -2,18 +2,12 @@ from typing import Union
 
 import falcon_sqla
 
-_sqla_manager: Union[falcon_sqla.Manager, None] = None
-
 
 class _SqlaManager:
-    @property
-    def manager(self):
-        return _sqla_manager
+    __slots__ = ("manager",)
 
-    @manager.setter
-    def manager(self, manager):
-        global _sqla_manager
-        _sqla_manager = manager
+    def __init__(self):
+        self.manager: Union[falcon_sqla.Manager, None] = None
 
 
 sqla_manager = _SqlaManager()
@@ -1,4 +1,11 @@
+from functools import lru_cache
 import re
+from string import ascii_lowercase, ascii_uppercase, digits
+
+_SLASH_RE = re.compile(r"/+")
+_LOWER = frozenset(ascii_lowercase)
+_LOWER_DIGIT = frozenset(ascii_lowercase + digits)
+_UPPER = frozenset(ascii_uppercase)
 
 
 def untrailing_slash_it(string):
@@ -18,23 +25,37 @@ def leading_slash_it(string):
 
 
 def unduplicate_slash_it(string):
-    return string.replace("//", "/")
+    return _SLASH_RE.sub("/", string)
 
 
+@lru_cache(maxsize=1024)
 def proper_slash_it(string):
-    return unduplicate_slash_it(leading_slash_it(untrailing_slash_it(string)))
+    return "/" + _SLASH_RE.sub("/", string.strip("/"))
 
 
 def camel_case_it(string):
-    return "".join(x.capitalize() for x in string.lower().split("_"))
+    return "".join(map(str.capitalize, string.lower().split("_")))
 
 
+@lru_cache(maxsize=4096)
 def lower_camel_case_it(string):
     camel_string = camel_case_it(string)
     return string[0].lower() + camel_string[1:]
 
 
 def camel_case_to_snake_case(string):
-    string = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", string)
-    string = re.sub("([a-z0-9])([A-Z])", r"\1_\2", string).lower()
-    return string
+    # Single pass equivalent of substituting "(.)([A-Z][a-z]+)" and then "([a-z0-9])([A-Z])" with r"\1_\2":
+    # an underscore goes before an uppercase letter following a lowercase letter or digit, or before one
+    # starting a capitalized word
+    ret = []
+    prev = ""
+    last = len(string) - 1
+    for i, char in enumerate(string):
+        if char in _UPPER and i and (
+            prev in _LOWER_DIGIT or (prev != "\n" and i < last and string[i + 1] in _LOWER)
+        ):
+            ret.append("_")
+        ret.append(char)
+        prev = char
+
+    return "".join(ret).lower()
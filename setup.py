@@ -1,3 +1,12 @@
+import os
+
 from setuptools import setup
 
-setup()
+# Optionally compile the record serializer with mypyc, requires mypy to be installed in the build environment
+ext_modules = []
+if os.environ.get("FALCON_BOILERPLATE_MYPYC"):
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["falcon_boilerplate/_serialize.py"])
+
+setup(ext_modules=ext_modules)